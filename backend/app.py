@@ -15,12 +15,11 @@ import time
 import json
 import redis
 import aiosmtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from email.message import EmailMessage
 
 from fastapi import FastAPI, HTTPException, Depends, Header, Request, Body, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 from pydantic import BaseModel, Field
 
 # Configure logging
@@ -81,46 +80,32 @@ def generate_download_token(conversation_id: str, account_id: str, file_type: st
     Returns:
         Secure download token
     """
+    return generate_download_tokens(conversation_id, account_id, [file_type])[file_type]
+
+def generate_download_tokens(conversation_id: str, account_id: str, file_types: List[str]) -> Dict[str, str]:
+    """
+    Generate secure download tokens for several files of one conversation
+    
+    Settings are read and Redis is checked once, and all tokens are stored
+    in a single pipelined round trip.
+    
+    Args:
+        conversation_id: The conversation ID
+        account_id: The account ID
+        file_types: Types of file (transcript, report, audio)
+        
+    Returns:
+        Dict mapping each file type to its secure download token
+    """
     from config import Settings
     
     settings = Settings()
-    token = secrets.token_urlsafe(32)
-    expires_at = time.time() + (settings.download_token_expiry_hours * 60 * 60)  # Configurable expiry
+    ttl_seconds = settings.download_token_expiry_hours * 60 * 60
+    expires_at = time.time() + ttl_seconds  # Configurable expiry
     
-    # Store token in Redis for shared access across pods
-    redis_client = get_redis_client()
-    if redis_client:
-        try:
-            token_data = {
-                'conversation_id': conversation_id,
-                'account_id': account_id,
-                'file_type': file_type,
-                'expires_at': expires_at,
-                'usage_count': 0,
-                'max_uses': settings.download_token_max_uses
-            }
-            # Store with expiration (Redis will auto-delete expired tokens)
-            redis_client.setex(
-                f"download_token:{token}",
-                settings.download_token_expiry_hours * 60 * 60,  # TTL in seconds
-                json.dumps(token_data)
-            )
-            logger.debug(f"Token stored in Redis: {token[:10]}...")
-        except Exception as e:
-            logger.error(f"Failed to store token in Redis: {e}")
-            # Fallback to in-memory storage
-            download_tokens[token] = {
-                'conversation_id': conversation_id,
-                'account_id': account_id,
-                'file_type': file_type,
-                'expires_at': expires_at,
-                'usage_count': 0,
-                'max_uses': settings.download_token_max_uses
-            }
-            logger.debug(f"Token stored in memory (fallback): {token[:10]}...")
-    else:
-        # Fallback to in-memory storage
-        download_tokens[token] = {
+    tokens = {file_type: secrets.token_urlsafe(32) for file_type in file_types}
+    token_records = {
+        token: {
             'conversation_id': conversation_id,
             'account_id': account_id,
             'file_type': file_type,
@@ -128,9 +113,28 @@ def generate_download_token(conversation_id: str, account_id: str, file_type: st
             'usage_count': 0,
             'max_uses': settings.download_token_max_uses
         }
-        logger.debug(f"Token stored in memory: {token[:10]}...")
+        for file_type, token in tokens.items()
+    }
     
-    return token
+    # Store tokens in Redis for shared access across pods
+    redis_client = get_redis_client()
+    if redis_client:
+        try:
+            # Store with expiration (Redis will auto-delete expired tokens)
+            pipeline = redis_client.pipeline(transaction=False)
+            for token, token_data in token_records.items():
+                pipeline.setex(f"download_token:{token}", ttl_seconds, json.dumps(token_data))
+            pipeline.execute()
+            logger.debug(f"{len(token_records)} tokens stored in Redis")
+            return tokens
+        except Exception as e:
+            logger.error(f"Failed to store tokens in Redis: {e}")
+    
+    # Fallback to in-memory storage
+    download_tokens.update(token_records)
+    logger.debug(f"{len(token_records)} tokens stored in memory")
+    
+    return tokens
 
 def validate_download_token(token: str) -> Optional[Dict[str, Any]]:
     """
@@ -191,12 +195,26 @@ async def lifespan(app: FastAPI):
     # TODO: Initialize MinIO client
     # TODO: Initialize OpenAI client
     # TODO: Initialize ElevenLabs client
+    from config import settings
+    from services.email_service import EmailService
+    from services.minio_service import MinIOService, close_minio_client
+    from services.openai_service import close_openai_client
+    
+    # Open the SMTP relay and object store connections before the first request
+    email_service = EmailService(settings)
+    await email_service.startup()
+    minio_service = MinIOService(settings)
+    await minio_service.startup()
     
     logger.info("Postprocess API started successfully")
     yield
     
     # Shutdown
     logger.info("Shutting down Postprocess API...")
+    await email_service.shutdown()
+    # The shared clients are closed here only, once the services are done with them
+    close_minio_client()
+    await close_openai_client()
     # TODO: Cleanup connections
 
 
@@ -225,6 +243,7 @@ class PostprocessRequest(BaseModel):
     account_id: str = Field(..., description="Account identifier for file organization")
     conversation_id: str = Field(..., description="ElevenLabs conversation ID to process")
     send_email: bool = Field(default=True, description="Whether to send email with report")
+    regenerate: bool = Field(default=False, description="Generate a fresh summary instead of reusing a cached one")
 
 
 class PostprocessResponse(BaseModel):
@@ -591,7 +610,9 @@ async def postprocess_conversation_internal(request: PostprocessRequest) -> Post
             raise HTTPException(status_code=500, detail=error_msg)
         
         prompt_template = prompt_result.get('prompt_template', '')
-        summary_result = await openai_service.summarize_conversation(transcript, prompt_template)
+        summary_result = await openai_service.summarize_conversation(
+            transcript, prompt_template, use_cache=not request.regenerate
+        )
         
         if summary_result.get('status') != 'success':
             error_msg = f"Failed to generate summary: {summary_result.get('error')}"
@@ -748,6 +769,14 @@ async def download_transcript(
         settings = Settings()
         minio_service = MinIOService(settings)
         
+        # Send the client straight to MinIO when presigned downloads are enabled
+        if settings.minio_presigned_downloads:
+            download_url = await minio_service.get_presigned_url(
+                account_id, conversation_id, 'transcript', f"transcript_{conversation_id}.txt"
+            )
+            if download_url:
+                return RedirectResponse(download_url)
+        
         # Get transcript file from MinIO
         file_data = await minio_service.get_transcript_file(account_id, conversation_id)
         
@@ -794,6 +823,14 @@ async def download_report(
         settings = Settings()
         minio_service = MinIOService(settings)
         
+        # Send the client straight to MinIO when presigned downloads are enabled
+        if settings.minio_presigned_downloads:
+            download_url = await minio_service.get_presigned_url(
+                account_id, conversation_id, 'report', f"report_{conversation_id}.pdf"
+            )
+            if download_url:
+                return RedirectResponse(download_url)
+        
         # Get PDF report from MinIO
         file_data = await minio_service.get_report_file(account_id, conversation_id)
         
@@ -840,6 +877,14 @@ async def download_audio(
         settings = Settings()
         minio_service = MinIOService(settings)
         
+        # Send the client straight to MinIO when presigned downloads are enabled
+        if settings.minio_presigned_downloads:
+            download_url = await minio_service.get_presigned_url(
+                account_id, conversation_id, 'audio', f"audio_{conversation_id}.mp3"
+            )
+            if download_url:
+                return RedirectResponse(download_url)
+        
         # Get audio file from MinIO
         file_data = await minio_service.get_audio_file(account_id, conversation_id)
         
@@ -892,26 +937,33 @@ async def download_file_secure(token: str) -> Response:
         
         # Get file based on type
         file_data = None
+        download_url = None
         filename = ""
         media_type = ""
         
         if file_type == 'transcript':
-            file_data = await minio_service.get_transcript_file(account_id, conversation_id)
+            get_file = minio_service.get_transcript_file
             filename = f"transcript_{conversation_id}.txt"
             media_type = 'text/plain'
         elif file_type == 'report':
-            file_data = await minio_service.get_report_file(account_id, conversation_id)
+            get_file = minio_service.get_report_file
             filename = f"report_{conversation_id}.pdf"
             media_type = 'application/pdf'
         elif file_type == 'audio':
-            file_data = await minio_service.get_audio_file(account_id, conversation_id)
+            get_file = minio_service.get_audio_file
             filename = f"audio_{conversation_id}.mp3"
             media_type = 'audio/mpeg'
         else:
             raise HTTPException(status_code=400, detail="Invalid file type")
         
-        if not file_data:
-            raise HTTPException(status_code=404, detail="File not found")
+        # Send the client straight to MinIO when presigned downloads are enabled
+        if settings.minio_presigned_downloads:
+            download_url = await minio_service.get_presigned_url(account_id, conversation_id, file_type, filename)
+        
+        if not download_url:
+            file_data = await get_file(account_id, conversation_id)
+            if not file_data:
+                raise HTTPException(status_code=404, detail="File not found")
         
         # Increment usage count and check if token should be deleted
         redis_client = get_redis_client()
@@ -950,6 +1002,9 @@ async def download_file_secure(token: str) -> Response:
                 else:
                     logger.debug(f"Token usage count updated to {download_tokens[token]['usage_count']} in memory: {token[:10]}...")
         
+        if download_url:
+            return RedirectResponse(download_url)
+        
         return Response(
             content=file_data['content'],
             media_type=media_type,
@@ -1145,7 +1200,7 @@ async def test_email(request: TestEmailRequest):
         email_service = EmailService(settings)
         
         # Test email service connection first
-        connection_result = email_service.test_email_connection()
+        connection_result = await email_service.test_email_connection()
         if connection_result.get("status") != "success":
             return {
                 "status": "error",
@@ -1153,7 +1208,7 @@ async def test_email(request: TestEmailRequest):
             }
         
         # Create a simple test email using the EmailService
-        msg = MIMEMultipart()
+        msg = EmailMessage()
         msg['From'] = email_service.from_email
         msg['To'] = request.to_email
         msg['Subject'] = request.subject
@@ -1180,10 +1235,10 @@ async def test_email(request: TestEmailRequest):
         </html>
         """
         
-        msg.attach(MIMEText(body, 'html'))
+        msg.set_content(body, subtype='html')
         
         # Send email using the EmailService
-        result = email_service.send_email_with_retry(msg)
+        result = await email_service.send_email_with_retry(msg)
         
         return {
             "status": "success",
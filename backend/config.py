@@ -41,6 +41,11 @@ class Settings(BaseSettings):
     openai_model: str = Field(default="gpt-4o-mini", env="OPENAI_MODEL")
     openai_max_tokens: int = Field(default=5000, env="OPENAI_MAX_TOKENS")
     openai_temperature: float = Field(default=0.7, env="OPENAI_TEMPERATURE")
+    openai_max_concurrency: int = Field(default=8, env="OPENAI_MAX_CONCURRENCY")
+    openai_timeout_seconds: float = Field(default=120.0, env="OPENAI_TIMEOUT_SECONDS")
+    openai_max_retries: int = Field(default=2, env="OPENAI_MAX_RETRIES")
+    # Off by default: summaries are sampled at openai_temperature, so a rerun is expected to differ
+    openai_summary_cache_ttl_seconds: int = Field(default=0, env="OPENAI_SUMMARY_CACHE_TTL_SECONDS")
     
     # MinIO Configuration
     minio_endpoint: str = Field(default="localhost:9000", env="MINIO_ENDPOINT")
@@ -49,6 +54,12 @@ class Settings(BaseSettings):
     minio_bucket_name: str = Field(default="fedfina-reports", env="MINIO_BUCKET_NAME")
     minio_secure: bool = Field(default=False, env="MINIO_SECURE")
     minio_region: str = Field(default="us-east-1", env="MINIO_REGION")
+    minio_pool_size: int = Field(default=32, env="MINIO_POOL_SIZE")
+    # Matches the minio SDK default; large multipart parts need the headroom on slow links
+    minio_read_timeout_seconds: float = Field(default=300.0, env="MINIO_READ_TIMEOUT_SECONDS")
+    # Redirect downloads to short-lived presigned MinIO URLs instead of
+    # proxying the bytes; only enable when clients can reach the endpoint
+    minio_presigned_downloads: bool = Field(default=False, env="MINIO_PRESIGNED_DOWNLOADS")
     
     # Email Configuration (Postfix SMTP Relay)
     # Note: Postfix relay uses IP-based authentication, no username/password required
@@ -56,6 +67,10 @@ class Settings(BaseSettings):
     smtp_from_name: str = Field(default="Postprocess API", env="SMTP_FROM_NAME")
     smtp_use_cc: Optional[str] = Field(default=None, env="SMTP_USE_CC")
     smtp_rate_limit_per_minute: int = Field(default=30, env="SMTP_RATE_LIMIT_PER_MINUTE")
+    smtp_max_concurrency: int = Field(default=5, env="SMTP_MAX_CONCURRENCY")
+    smtp_use_starttls: bool = Field(default=False, env="SMTP_USE_STARTTLS")
+    smtp_pool_size: int = Field(default=5, env="SMTP_POOL_SIZE")
+    smtp_max_msgs_per_conn: int = Field(default=100, env="SMTP_MAX_MSGS_PER_CONN")
     
     # API Security
     api_secret_key: str = Field(..., env="API_SECRET_KEY")
@@ -1,21 +1,383 @@
 """
 Email Service for sending PDF reports using Postfix SMTP relay
 """
+import asyncio
+import hashlib
+import io
 import logging
-import smtplib
+import quopri
+import re
+import socket
 import ssl
+import string
+import threading
 import time
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
-from typing import Dict, Any, Optional, List
-from datetime import datetime
-from functools import wraps
+from collections import OrderedDict
+from email import policy
+from email.generator import BytesGenerator
+from email.message import EmailMessage, Message
+from email.utils import getaddresses
+from typing import Callable, Dict, Any, Optional, List, Set, Tuple, Union
+from datetime import datetime, timezone
+from functools import lru_cache
+
+import aiosmtplib
+
 from config import Settings
 
 logger = logging.getLogger(__name__)
 
+# Conversation report email, compiled once at import. Rendering only
+# substitutes the per-conversation fields; the CSS contains no "$".
+_REPORT_HTML_TEMPLATE = string.Template("""
+        <html>
+        <head>
+            <style>
+                body { 
+                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
+                    line-height: 1.6; 
+                    color: #1f2937; 
+                    max-width: 600px; 
+                    margin: 0 auto; 
+                    background-color: #f9fafb;
+                }
+                .header { 
+                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+                    color: white; 
+                    padding: 30px 20px; 
+                    border-radius: 12px 12px 0 0; 
+                    text-align: center; 
+                    margin-bottom: 0;
+                }
+                .content { 
+                    padding: 30px 20px; 
+                    background-color: white; 
+                    border-radius: 0 0 12px 12px;
+                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.05);
+                }
+                .metadata { 
+                    background-color: #f3f4f6; 
+                    padding: 20px; 
+                    border-radius: 8px; 
+                    margin: 20px 0; 
+                    border-left: 4px solid #3b82f6;
+                }
+                .footer { 
+                    background-color: #f8f9fa; 
+                    padding: 20px; 
+                    border-radius: 8px; 
+                    font-size: 12px; 
+                    color: #6b7280; 
+                    text-align: center; 
+                    margin-top: 20px;
+                    border: 1px solid #e5e7eb;
+                }
+                .highlight { color: #3b82f6; font-weight: 600; }
+                .download-section { 
+                    background: linear-gradient(135deg, #dbeafe 0%, #bfdbfe 100%); 
+                    padding: 25px; 
+                    border-radius: 12px; 
+                    margin: 25px 0; 
+                    border: 1px solid #93c5fd;
+                }
+                .download-links { display: flex; flex-direction: column; gap: 15px; }
+                .download-item { text-align: center; }
+                .download-button { 
+                    display: inline-block; 
+                    background-color: #2563eb; 
+                    color: #ffffff; 
+                    padding: 15px 30px; 
+                    text-decoration: none; 
+                    border-radius: 8px; 
+                    font-weight: 600;
+                    font-size: 16px;
+                    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
+                    border: 2px solid #1d4ed8;
+                    transition: all 0.3s ease;
+                }
+                .download-button:hover { 
+                    background-color: #1d4ed8; 
+                    transform: translateY(-1px);
+                    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.15);
+                }
+                .download-description { margin-top: 5px; font-size: 14px; color: #666; }
+                .download-note { 
+                    background-color: #fef3c7; 
+                    border: 1px solid #f59e0b; 
+                    padding: 15px; 
+                    border-radius: 8px; 
+                    margin-top: 20px;
+                    font-size: 13px;
+                    color: #92400e;
+                }
+                .file-info { 
+                    background-color: #d1fae5; 
+                    border: 1px solid #10b981; 
+                    padding: 15px; 
+                    border-radius: 8px; 
+                    margin: 15px 0;
+                    color: #065f46;
+                }
+            </style>
+        </head>
+        <body>
+            <div class="header">
+                <h2>🎉 Conversation Analysis Complete!</h2>
+                <p>Your conversation has been processed and analyzed successfully.</p>
+            </div>
+            
+            <div class="content">
+                <h3>Customer Information</h3>
+                <ul>
+                    <li><strong>Customer Name:</strong> <span class="highlight">$customer_name</span></li>
+                    <li><strong>Business Name:</strong> $business_name</li>
+                    <li><strong>Conversation ID:</strong> $conversation_id</li>
+                    <li><strong>Report Generated:</strong> $generated_at</li>
+                </ul>
+                
+                <div class="metadata">
+                    <h4>Executive Summary</h4>
+                    <p style="margin: 10px 0; line-height: 1.6;">$executive_summary</p>
+                </div>
+                
+                <div class="file-info">
+                    <h4>Generated Files</h4>
+                    <p>The following files have been created for your conversation:</p>
+                    <ul>
+                        <li><strong>Transcript:</strong> Complete conversation in text format</li>
+                        <li><strong>Report:</strong> Detailed PDF analysis with financial insights</li>
+                        <li><strong>Audio:</strong> Original conversation recording</li>
+                    </ul>
+                </div>
+                
+                $download_links_html
+                
+                <div class="metadata">
+                    <h4>What's Included in Your Report</h4>
+                    <ul>
+                        <li>Detailed income breakdown with calculations</li>
+                        <li>Comprehensive expense analysis</li>
+                        <li>Loan disbursement requirements and repayment capacity</li>
+                        <li>Risk assessment and recommendations</li>
+                        <li>Complete conversation transcript</li>
+                    </ul>
+                </div>
+            </div>
+            
+            <div class="footer">
+                <p>This report was generated automatically by the FedFina Postprocess API.</p>
+                <p>If you have any questions or need assistance, please contact our support team.</p>
+                <p><small>Generated on: $generated_at</small></p>
+            </div>
+        </body>
+        </html>
+        """)
+
+_DOWNLOAD_SECTION_TEMPLATE = string.Template("""
+            <div class="download-section">
+                <h3>Download Your Files</h3>
+                <p>Click on the links below to download your conversation files:</p>
+                <div class="download-links">
+            $items
+                </div>
+                <div class="download-note">
+                    <p><strong>Security Note:</strong> These links are secure and will expire after 24 hours or after 10 downloads. No authentication required.</p>
+                </div>
+            </div>
+            """)
+
+_DOWNLOAD_ITEM_TEMPLATE = string.Template("""
+                    <div class="download-item">
+                        <a href="$url" class="download-button">
+                            $icon $label
+                        </a>
+                        <p class="download-description">$description</p>
+                    </div>
+                """)
+
+# (file type, icon, label, description) of each download link, in display order
+_DOWNLOAD_ITEMS = (
+    ('transcript', '📄', 'Download Transcript (TXT)', 'Complete conversation transcript in text format'),
+    ('report', '📊', 'Download Report (PDF)', 'Detailed analysis report with financial insights'),
+    ('audio', '🎵', 'Download Audio (MP3)', 'Original conversation audio recording'),
+)
+
+
+@lru_cache(maxsize=8)
+def _download_section_template(file_types: Tuple[str, ...]) -> string.Template:
+    """
+    Get the download section for one combination of linked files
+
+    The rows are assembled once per combination (at most eight) and leave a
+    $<file type>_url placeholder for each link.
+    """
+    items = "".join(
+        _DOWNLOAD_ITEM_TEMPLATE.substitute(
+            url=f"${file_type}_url",
+            icon=icon,
+            label=label,
+            description=description
+        )
+        for file_type, icon, label, description in _DOWNLOAD_ITEMS
+        if file_type in file_types
+    )
+    return string.Template(_DOWNLOAD_SECTION_TEMPLATE.substitute(items=items))
+
+# Basic email address format, compiled once
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Serialized PDF report messages (without the To header or the HTML body)
+# shared across service instances, so resending the same report skips the
+# base64 pass over the PDF. Entries are split around the body placeholder and
+# the cache is bounded by the bytes it holds, since each entry carries a PDF.
+MIME_CACHE_MAX_BYTES = 32 * 1024 * 1024
+_REPORT_BODY_PLACEHOLDER = b"fedfina-report-body-placeholder"
+_mime_cache: "OrderedDict[tuple, Tuple[bytes, bytes]]" = OrderedDict()
+_mime_cache_bytes = 0
+_mime_cache_lock = threading.Lock()
+
+# Formatted timestamps, refreshed at most once per second
+_timestamp_cache: Tuple[float, str, str] = (0.0, "", "")
+
+
+def _now_strings() -> Tuple[str, str]:
+    """Get the current (ISO, human readable) timestamps, cached for one second"""
+    global _timestamp_cache
+    checked_at, iso_timestamp, human_timestamp = _timestamp_cache
+    now = time.monotonic()
+    if not iso_timestamp or now - checked_at >= 1.0:
+        current = datetime.now()
+        iso_timestamp = current.isoformat()
+        # The email footer labels the time as UTC, so format it in UTC
+        human_timestamp = current.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
+        _timestamp_cache = (now, iso_timestamp, human_timestamp)
+    return iso_timestamp, human_timestamp
+
+
+def _extract(obj: Any, *keys: str, default: Any = None) -> Any:
+    """
+    Walk nested keys through dicts or model attributes alike
+
+    Returns the default as soon as a level is missing or empty, so parsed
+    summaries work whether they are Pydantic models or plain dicts.
+    """
+    current = obj
+    for key in keys:
+        current = current.get(key) if isinstance(current, dict) else getattr(current, key, None)
+        if not current:
+            return default
+    return current
+
+
+# Download token generator, resolved from the app module on first use
+# (app imports this service, so it cannot be imported at module load)
+_download_tokens_fn: Optional[Callable[[str, str, List[str]], Dict[str, str]]] = None
+
+
+def get_download_tokens_fn() -> Callable[[str, str, List[str]], Dict[str, str]]:
+    """Get the app's generate_download_tokens function"""
+    global _download_tokens_fn
+    if _download_tokens_fn is None:
+        from app import generate_download_tokens
+        _download_tokens_fn = generate_download_tokens
+    return _download_tokens_fn
+
+
+# Earliest time.monotonic() at which the next send may start, shared by all
+# instances so the rate limit applies process-wide
+_next_send_at = 0.0
+
+# Concurrent SMTP sends allowed per process
+_send_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def get_send_semaphore(limit: int) -> asyncio.Semaphore:
+    """Get the process-wide semaphore bounding concurrent SMTP sends"""
+    global _send_semaphore
+    if _send_semaphore is None:
+        _send_semaphore = asyncio.Semaphore(max(1, limit))
+    return _send_semaphore
+
+
+# Outbound messages are queued for a pool of background workers, one per
+# allowed concurrent send, so a burst of reports is spread over the pooled
+# relay connections and one slow send does not hold up the rest
+EMAIL_QUEUE_MAXSIZE = 1000
+# A batch of at least this many sends is aborted once a third of them failed
+# at the relay; refused recipients do not count
+EMAIL_BATCH_ABORT_MIN = 30
+_BATCH_ABORTED_ERROR = "Email batch aborted after repeated relay failures"
+_email_queue: Optional[asyncio.Queue] = None
+_email_workers: List[asyncio.Task] = []
+# Futures of the messages the workers are sending right now
+_inflight_sends: Set[asyncio.Future] = set()
+
+# Fire-and-forget report sends still in flight, awaited on shutdown
+_pending_sends: Set[asyncio.Task] = set()
+
+
+def new_email_batch() -> Dict[str, Any]:
+    """
+    Start a batch of sends that is aborted together once the relay keeps failing
+    
+    Pass the same batch to each send of a bulk run; sends without one are
+    never aborted on account of other callers' failures.
+    
+    Returns:
+        Batch counters to pass as the batch argument of the send methods
+    """
+    return {"sends": 0, "relay_failures": 0, "aborted": False}
+
+
+def _encode_html_body(body_html: str) -> bytes:
+    """Encode an HTML body as quoted-printable UTF-8 with CRLF line endings"""
+    encoded = quopri.encodestring(body_html.encode('utf-8'))
+    if not encoded.endswith(b"\n"):
+        encoded += b"\n"
+    return encoded.replace(b"\n", b"\r\n")
+
+
+def _serialize_message(msg: Message) -> bytes:
+    """
+    Flatten a message into SMTP wire format (CRLF line endings)
+
+    The generator writes straight into one BytesIO whose buffer is handed
+    back without a further copy, and the caller drops the message (and its
+    base64 text payload) right after, so only the wire bytes stay alive.
+    """
+    buffer = io.BytesIO()
+    BytesGenerator(buffer, mangle_from_=False, policy=policy.SMTP).flatten(msg)
+    return buffer.getvalue()
+
+
+# Idle relay connections kept open between sends, shared by all instances and
+# keyed by (host, port, starttls) so differently configured relays never mix.
+# Each entry carries the number of messages already sent on the connection.
+# Checkout and checkin do not await while touching the pool, so no lock is needed.
+_idle_connections: Dict[Tuple[str, int, bool], List[Tuple[aiosmtplib.SMTP, int]]] = {}
+
+# Name sent in EHLO. Without it aiosmtplib calls socket.getfqdn(), a blocking
+# reverse DNS lookup, on every new connection.
+_LOCAL_HOSTNAME = socket.gethostname()
+
+# Relay host name -> (resolved address, time.monotonic() of the lookup), so
+# connects skip the cluster DNS round trip for RELAY_DNS_TTL seconds
+RELAY_DNS_TTL = 30.0
+_resolved_hosts: Dict[str, Tuple[str, float]] = {}
+
+# Shared TLS context for STARTTLS (loading the CA bundle is done only once)
+_tls_context: Optional[ssl.SSLContext] = None
+
+
+def get_tls_context() -> ssl.SSLContext:
+    """Get the shared TLS 1.3 client context used for STARTTLS"""
+    global _tls_context
+    if _tls_context is None:
+        context = ssl.create_default_context()
+        context.minimum_version = ssl.TLSVersion.TLSv1_3
+        _tls_context = context
+    return _tls_context
+
 
 class EmailService:
     """Service for sending emails with download links using Postfix SMTP relay"""
@@ -25,54 +387,268 @@ class EmailService:
         self.smtp_host = "postfix-relay.mail-service-prod.svc.cluster.local"
         self.smtp_port = 25
         self.from_email = "info@bionicaisolutions.com"
+        self.use_starttls = getattr(settings, 'smtp_use_starttls', False)
         self.settings = settings
 
         # Rate limiting configuration from settings
         self.rate_limit_calls_per_minute = getattr(settings, 'smtp_rate_limit_per_minute', 30)
-        self.rate_limit_last_called = [0.0]
+        self._min_interval = 60.0 / self.rate_limit_calls_per_minute
+        self.max_concurrency = getattr(settings, 'smtp_max_concurrency', 5)
+
+        # Connection pool limits: idle connections kept per relay and messages
+        # sent on one connection before it is rotated
+        self.pool_size = getattr(settings, 'smtp_pool_size', 5)
+        self.max_msgs_per_conn = getattr(settings, 'smtp_max_msgs_per_conn', 100)
 
         logger.info(f"Email service initialized with Postfix relay: {self.smtp_host}:{self.smtp_port}")
 
-    def rate_limit(self, func):
-        """Decorator to implement rate limiting"""
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            elapsed = time.time() - self.rate_limit_last_called[0]
-            left_to_wait = 60.0 / self.rate_limit_calls_per_minute - elapsed
-            if left_to_wait > 0:
-                logger.info(f"Rate limiting: waiting {left_to_wait:.2f} seconds")
-                time.sleep(left_to_wait)
-            ret = func(*args, **kwargs)
-            self.rate_limit_last_called[0] = time.time()
-            return ret
-        return wrapper
+    async def _resolve_relay_host(self) -> str:
+        """Get the relay address, looking the host name up at most every RELAY_DNS_TTL seconds"""
+        now = time.monotonic()
+        cached = _resolved_hosts.get(self.smtp_host)
+        if cached is not None and now - cached[1] < RELAY_DNS_TTL:
+            return cached[0]
+        try:
+            addresses = await asyncio.get_running_loop().getaddrinfo(
+                self.smtp_host, self.smtp_port, type=socket.SOCK_STREAM
+            )
+        except OSError as e:
+            # Let the connect attempt report the failure
+            logger.warning(f"Could not resolve SMTP relay {self.smtp_host}: {e}")
+            return self.smtp_host
+        address = addresses[0][4][0]
+        _resolved_hosts[self.smtp_host] = (address, now)
+        return address
+
+    async def _connect(self, timeout: float = 30.0) -> aiosmtplib.SMTP:
+        """Open a new connection to the SMTP relay"""
+        smtp = aiosmtplib.SMTP(
+            hostname=await self._resolve_relay_host(),
+            port=self.smtp_port,
+            local_hostname=_LOCAL_HOSTNAME,
+            timeout=timeout,
+            start_tls=False
+        )
+        try:
+            await smtp.connect()
+        except OSError:
+            # The relay may have moved, resolve it again on the next attempt
+            _resolved_hosts.pop(self.smtp_host, None)
+            raise
+        try:
+            if self.use_starttls:
+                # Connected by address, so verify the certificate against the host name
+                await smtp.starttls(server_hostname=self.smtp_host, tls_context=get_tls_context())
+            # Greet the relay now, so a handshake failure surfaces at connect
+            # rather than in the middle of the first send
+            await smtp.ehlo()
+        except BaseException:
+            # Do not leak the open socket when the handshake fails
+            smtp.close()
+            raise
+        return smtp
+
+    @property
+    def _pool_key(self) -> Tuple[str, int, bool]:
+        """Key of this service's relay in the shared connection pool"""
+        return (self.smtp_host, self.smtp_port, self.use_starttls)
+
+    async def _checkout_connection(self) -> Tuple[aiosmtplib.SMTP, int]:
+        """
+        Take a live idle connection to the relay, or open a new one
+
+        Returns:
+            The connection and the number of messages already sent on it
+        """
+        idle = _idle_connections.setdefault(self._pool_key, [])
+        while idle:
+            smtp, sent = idle.pop()
+            try:
+                if smtp.is_connected and (await smtp.noop()).code == 250:
+                    return smtp, sent
+            except (aiosmtplib.SMTPException, OSError):
+                pass
+            # Dropped by the relay while idle
+            smtp.close()
+        return await self._connect(), 0
+
+    async def _checkin_connection(self, smtp: aiosmtplib.SMTP, sent: int) -> None:
+        """Return a healthy connection for reuse, or retire it once it hit its message cap"""
+        idle = _idle_connections.setdefault(self._pool_key, [])
+        if sent < self.max_msgs_per_conn and len(idle) < self.pool_size:
+            idle.append((smtp, sent))
+            return
+        await self._close_connection(smtp)
+
+    async def _close_connection(self, smtp: aiosmtplib.SMTP) -> None:
+        """Close a relay connection politely, dropping it if QUIT fails"""
+        try:
+            await smtp.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            smtp.close()
+
+    async def startup(self) -> None:
+        """Open a relay connection ahead of the first send"""
+        if self.settings.disable_email_sending:
+            return
+        try:
+            await self._checkin_connection(await self._connect(), 0)
+            logger.info(f"Email service connection warmed up: {self.smtp_host}:{self.smtp_port}")
+        except (aiosmtplib.SMTPException, OSError) as e:
+            logger.warning(f"Email service warm-up failed, connecting on first send: {e}")
+
+    async def shutdown(self) -> None:
+        """Finish in-flight sends, stop the email workers and close the idle relay connections"""
+        global _email_queue, _email_workers, _send_semaphore
+        if _pending_sends:
+            await asyncio.gather(*_pending_sends, return_exceptions=True)
+        # Wake the callers of interrupted sends before cancelling the workers
+        for future in _inflight_sends:
+            if not future.done():
+                future.set_exception(RuntimeError("Email service shutting down"))
+        _inflight_sends.clear()
+        for worker in _email_workers:
+            worker.cancel()
+        _email_workers = []
+        if _email_queue is not None:
+            self._abort_queued(_email_queue, "Email service shutting down")
+            _email_queue = None
+        # Recreated on the running loop by the next send
+        _send_semaphore = None
+
+        connections = [smtp for idle in _idle_connections.values() for smtp, _ in idle]
+        _idle_connections.clear()
+        for smtp in connections:
+            await self._close_connection(smtp)
+
+    async def _throttle(self) -> None:
+        """Reserve the next send slot allowed by the rate limit and wait for it"""
+        global _next_send_at
+        # The slot is read and advanced with no await in between, so concurrent
+        # senders each reserve a distinct slot instead of waking up together
+        now = time.monotonic()
+        slot = max(now, _next_send_at)
+        _next_send_at = slot + self._min_interval
+        left_to_wait = slot - now
+        if left_to_wait > 0:
+            logger.info(f"Rate limiting: waiting {left_to_wait:.2f} seconds")
+            await asyncio.sleep(left_to_wait)
 
     def validate_email_address(self, email: str) -> bool:
         """Validate email address format"""
-        try:
-            import re
-            # Basic email validation regex
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if re.match(email_pattern, email):
-                # Additional validation for common issues
-                if '..' in email or email.startswith('.') or email.endswith('.'):
-                    return False
-                return True
-            return False
-        except Exception as e:
-            logger.error(f"Email validation error: {e}")
-            return False
+        # Basic format, plus common issues the pattern lets through
+        return (
+            _EMAIL_RE.match(email) is not None
+            and '..' not in email
+            and not email.startswith('.')
+            and not email.endswith('.')
+        )
+
+    async def _send_throttled(self, raw_message: bytes, to_addrs: List[str]) -> Dict[str, Any]:
+        """Send under the shared concurrency limit and rate limiter"""
+        async with get_send_semaphore(self.max_concurrency):
+            await self._throttle()
+            return await self.send_email_with_retry(raw_message, to_addrs=to_addrs)
+
+    async def _send_queued(
+        self,
+        raw_message: bytes,
+        to_addrs: List[str],
+        batch: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Queue a message for the background email workers and wait for its send result"""
+        global _email_queue, _email_workers
+        if batch is not None and batch["aborted"]:
+            return {"status": "error", "error": _BATCH_ABORTED_ERROR, "attempts": 0}
+        if _email_queue is None:
+            _email_queue = asyncio.Queue(maxsize=EMAIL_QUEUE_MAXSIZE)
+        _email_workers = [worker for worker in _email_workers if not worker.done()]
+        while len(_email_workers) < max(1, self.max_concurrency):
+            _email_workers.append(asyncio.create_task(self._drain_email_queue(_email_queue)))
+
+        future = asyncio.get_running_loop().create_future()
+        await _email_queue.put((raw_message, to_addrs, batch, future))
+        return await future
+
+    async def _drain_email_queue(self, queue: asyncio.Queue) -> None:
+        """Send queued messages as they come in, aborting a batch whose sends keep failing at the relay"""
+        while True:
+            raw_message, to_addrs, batch, future = await queue.get()
+            try:
+                if future.done():
+                    # The caller stopped waiting
+                    continue
+                if batch is not None and batch["aborted"]:
+                    future.set_result({"status": "error", "error": _BATCH_ABORTED_ERROR, "attempts": 0})
+                    continue
+                _inflight_sends.add(future)
+                try:
+                    result = await self._send_throttled(raw_message, to_addrs)
+                except Exception as e:
+                    logger.error(f"Queued email send failed: {e}")
+                    result = {
+                        "status": "error",
+                        "error": f"Email sending failed: {str(e)}",
+                        "attempts": 0,
+                        "relay_failure": True
+                    }
+                finally:
+                    _inflight_sends.discard(future)
+                if not future.done():
+                    future.set_result(result)
+
+                if batch is not None:
+                    batch["sends"] += 1
+                    if result.get("relay_failure"):
+                        batch["relay_failures"] += 1
+                    failed, total = batch["relay_failures"], batch["sends"]
+                    if not batch["aborted"] and total >= EMAIL_BATCH_ABORT_MIN and failed * 3 >= total:
+                        logger.error(f"Aborting email batch: {failed} of {total} sends failed at the relay")
+                        batch["aborted"] = True
+            finally:
+                queue.task_done()
+
+    def _abort_queued(self, queue: asyncio.Queue, reason: str) -> None:
+        """Fail every message still waiting in the queue"""
+        while not queue.empty():
+            _, _, _, future = queue.get_nowait()
+            if not future.done():
+                future.set_result({"status": "error", "error": reason, "attempts": 0})
+            queue.task_done()
+
+    async def send_email_with_retry(
+        self,
+        msg: Union[Message, bytes],
+        max_retries: int = 3,
+        to_addrs: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Send email with retry mechanism and exponential backoff
+
+        Args:
+            msg: Message object, or an already serialized message
+                (a Message is serialized in a worker thread, with Bcc moved to the envelope)
+            max_retries: Maximum number of send attempts
+            to_addrs: Envelope recipients, required when msg is raw bytes
+        """
+        if isinstance(msg, Message):
+            # Serialize once, off the event loop, instead of on every attempt
+            if to_addrs is None:
+                headers = msg.get_all('To', []) + msg.get_all('Cc', []) + msg.get_all('Bcc', [])
+                to_addrs = [address for _, address in getaddresses(headers)]
+            del msg['Bcc']
+            msg = await asyncio.to_thread(_serialize_message, msg)
 
-    def send_email_with_retry(self, msg: MIMEMultipart, max_retries: int = 3) -> Dict[str, Any]:
-        """Send email with retry mechanism and exponential backoff"""
         for attempt in range(max_retries):
+            smtp = None
             try:
                 logger.info(f"Attempting to send email (attempt {attempt + 1}/{max_retries})")
 
-                # Connect to Postfix SMTP relay (no authentication required)
-                server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=30.0)
-                server.send_message(msg)
-                server.quit()
+                # Reuse a warm connection to the Postfix relay (no authentication required)
+                smtp, sent = await self._checkout_connection()
+                await smtp.sendmail(self.from_email, to_addrs, msg)
+                connection, smtp = smtp, None
+                await self._checkin_connection(connection, sent + 1)
 
                 logger.info("Email sent successfully")
                 return {
@@ -81,32 +657,56 @@ class EmailService:
                     "attempts": attempt + 1
                 }
 
-            except smtplib.SMTPException as e:
+            except aiosmtplib.SMTPRecipientsRefused as e:
+                # Permanent for this message, retrying cannot succeed. The
+                # transaction was reset, so the connection stays usable.
+                logger.error(f"Recipients refused: {e.recipients}")
+                connection, smtp = smtp, None
+                await self._checkin_connection(connection, sent + 1)
+                return {
+                    "status": "error",
+                    "error": f"Recipients refused: {e.recipients}",
+                    "attempts": attempt + 1
+                }
+
+            except aiosmtplib.SMTPResponseException as e:
                 logger.warning(f"SMTP error on attempt {attempt + 1}: {e}")
+                if e.code >= 500 or attempt == max_retries - 1:
+                    logger.error(f"Failed to send email after {attempt + 1} attempts")
+                    return {
+                        "status": "error",
+                        "error": f"SMTP error: {str(e)}",
+                        "attempts": attempt + 1,
+                        # A 5xx rejects this message; a lasting 4xx means the relay is struggling
+                        "relay_failure": e.code < 500
+                    }
+
+            except (aiosmtplib.SMTPException, OSError) as e:
+                # Disconnects, timeouts and refused connections are transient
+                logger.warning(f"SMTP connection error on attempt {attempt + 1}: {e}")
                 if attempt == max_retries - 1:
                     logger.error(f"Failed to send email after {max_retries} attempts")
                     return {
                         "status": "error",
                         "error": f"SMTP error: {str(e)}",
-                        "attempts": attempt + 1
+                        "attempts": attempt + 1,
+                        "relay_failure": True
                     }
-                # Exponential backoff
-                wait_time = 2 ** attempt
-                logger.info(f"Waiting {wait_time} seconds before retry...")
-                time.sleep(wait_time)
 
-            except Exception as e:
-                logger.error(f"Unexpected error sending email: {e}")
-                return {
-                    "status": "error",
-                    "error": f"Unexpected error: {str(e)}",
-                    "attempts": attempt + 1
-                }
+            finally:
+                if smtp is not None:
+                    smtp.close()
+
+            # Exponential backoff
+            wait_time = 2 ** attempt
+            logger.info(f"Waiting {wait_time} seconds before retry...")
+            await asyncio.sleep(wait_time)
 
         return {
             "status": "error",
             "error": "Maximum retries exceeded",
-            "attempts": max_retries
+            "attempts": max_retries,
+            "relay_failure": True
         }
 
     async def send_conversation_report(
@@ -115,7 +715,8 @@ class EmailService:
         conversation_id: str,
         account_id: str,
         files: Dict[str, str],
-        metadata: Dict[str, Any]
+        metadata: Dict[str, Any],
+        batch: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Send a conversation report via email with download links
@@ -126,6 +727,7 @@ class EmailService:
             account_id: The account ID for file organization
             files: Dictionary containing file URLs
             metadata: Additional metadata about the conversation
+            batch: Bulk run this send belongs to, from new_email_batch()
 
         Returns:
             Dict containing the email sending result
@@ -153,36 +755,139 @@ class EmailService:
 
             logger.info(f"Sending conversation report to {to_email} for conversation {conversation_id}")
 
-            # Create email message
-            msg = MIMEMultipart()
-            msg['From'] = self.from_email
-            msg['To'] = to_email
-            msg['Subject'] = f"Conversation Analysis Report - {account_id or 'Customer'}"
-
-            # Create email body with download links
-            body = self._create_email_body_with_links(conversation_id, account_id, files, metadata)
-            msg.attach(MIMEText(body, 'html'))
+            # Render and serialize the message in a worker thread (CPU-bound)
+            raw_message = await asyncio.to_thread(
+                self._build_conversation_message,
+                to_email,
+                conversation_id,
+                account_id,
+                files,
+                metadata
+            )
 
             # Apply rate limiting and send email
-            rate_limited_send = self.rate_limit(self.send_email_with_retry)
-            result = rate_limited_send(msg)
+            result = await self._send_queued(raw_message, [to_email], batch)
+            return self._format_send_result(result, to_email, conversation_id)
+
+        except Exception as e:
+            logger.error(f"Error sending email: {e}")
+            return {
+                "status": "error",
+                "error": f"Email sending failed: {str(e)}",
+                "conversation_id": conversation_id
+            }
+
+    def enqueue_conversation_report(
+        self,
+        to_email: str,
+        conversation_id: str,
+        account_id: str,
+        files: Dict[str, str],
+        metadata: Dict[str, Any],
+        batch: Optional[Dict[str, Any]] = None
+    ) -> asyncio.Task:
+        """
+        Send a conversation report in the background without waiting for delivery
 
-            if result["status"] == "success":
+        Use send_conversation_report instead when the caller needs the result.
+
+        Args:
+            to_email: Recipient email address
+            conversation_id: The conversation ID
+            account_id: The account ID for file organization
+            files: Dictionary containing file URLs
+            metadata: Additional metadata about the conversation
+            batch: Bulk run this send belongs to, from new_email_batch()
+
+        Returns:
+            Task resolving to the email sending result
+        """
+        task = asyncio.create_task(
+            self.send_conversation_report(to_email, conversation_id, account_id, files, metadata, batch)
+        )
+        _pending_sends.add(task)
+
+        def on_done(done: asyncio.Task) -> None:
+            _pending_sends.discard(done)
+            if done.cancelled():
+                return
+            result = done.result()
+            if result.get("status") != "success":
+                logger.error(f"Background email for conversation {conversation_id} failed: {result.get('error')}")
+
+        task.add_done_callback(on_done)
+        return task
+
+    async def send_conversation_report_to_many(
+        self,
+        to_emails: List[str],
+        conversation_id: str,
+        account_id: str,
+        files: Dict[str, str],
+        metadata: Dict[str, Any],
+        batch: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Send one conversation report to several recipients in a single SMTP transaction
+
+        The message is rendered once and delivered with one MAIL FROM, one
+        RCPT TO per recipient and a single DATA. Recipients are not disclosed
+        to each other.
+
+        Args:
+            to_emails: Recipient email addresses
+            conversation_id: The conversation ID
+            account_id: The account ID for file organization
+            files: Dictionary containing file URLs
+            metadata: Additional metadata about the conversation
+            batch: Bulk run this send belongs to, from new_email_batch()
+
+        Returns:
+            Dict containing the email sending result
+        """
+        try:
+            # Check if email sending is disabled for testing
+            if self.settings.disable_email_sending:
+                logger.info(f"Email sending disabled for testing. Would send to: {to_emails}")
                 return {
                     "status": "success",
-                    "message": f"Email sent successfully to {to_email}",
+                    "message": "Email sending disabled for testing",
+                    "to_emails": to_emails,
                     "conversation_id": conversation_id,
-                    "timestamp": datetime.now().isoformat(),
-                    "attempts": result.get("attempts", 1)
+                    "account_id": account_id
                 }
-            else:
+
+            # Validate email addresses, dropping the invalid ones
+            recipients = [email for email in to_emails if self.validate_email_address(email)]
+            invalid_recipients = [email for email in to_emails if email not in recipients]
+            if invalid_recipients:
+                logger.error(f"Invalid email addresses: {invalid_recipients}")
+            if not recipients:
                 return {
                     "status": "error",
-                    "error": result["error"],
-                    "conversation_id": conversation_id,
-                    "attempts": result.get("attempts", 0)
+                    "error": f"No valid email addresses: {to_emails}",
+                    "conversation_id": conversation_id
                 }
 
+            logger.info(f"Sending conversation report to {len(recipients)} recipients for conversation {conversation_id}")
+
+            # Render and serialize the message once in a worker thread (CPU-bound)
+            raw_message = await asyncio.to_thread(
+                self._build_conversation_message,
+                "undisclosed-recipients:;",
+                conversation_id,
+                account_id,
+                files,
+                metadata
+            )
+
+            # Apply rate limiting and send email
+            result = await self._send_queued(raw_message, recipients, batch)
+            response = self._format_send_result(result, ", ".join(recipients), conversation_id)
+            response["recipients"] = recipients
+            response["invalid_recipients"] = invalid_recipients
+            return response
+
         except Exception as e:
             logger.error(f"Error sending email: {e}")
             return {
@@ -191,6 +896,28 @@ class EmailService:
                 "conversation_id": conversation_id
             }
 
+    def _build_conversation_message(
+        self,
+        to_email: str,
+        conversation_id: str,
+        account_id: str,
+        files: Dict[str, str],
+        metadata: Dict[str, Any]
+    ) -> bytes:
+        """Build and serialize the conversation report email with download links"""
+        msg = EmailMessage()
+        msg['From'] = self.from_email
+        msg['To'] = to_email
+        msg['Subject'] = f"Conversation Analysis Report - {account_id or 'Customer'}"
+
+        # Create email body with download links
+        body = self._create_email_body_with_links(conversation_id, account_id, files, metadata)
+        # Quoted-printable keeps the body 7-bit clean and its lines short,
+        # whatever the relay supports and however long the summary is
+        msg.set_content(body, subtype='html', charset='utf-8', cte='quoted-printable')
+
+        return _serialize_message(msg)
+
     def _create_email_body_with_links(
         self,
         conversation_id: str,
@@ -200,254 +927,37 @@ class EmailService:
     ) -> str:
         """Create the email body HTML content with download links"""
         
-        # Extract business summary from parsed data
-        from models.openai_response_models import OpenAIStructuredResponse
-        
+        # Extract business summary from parsed data (Pydantic model or dict)
         parsed_summary = metadata.get('parsed_summary')
-        customer_name = account_id or 'Customer'
-        business_name = 'Not specified'
-        executive_summary = 'Analysis completed successfully.'
-        
-        if parsed_summary:
-            try:
-                if isinstance(parsed_summary, OpenAIStructuredResponse):
-                    # Handle Pydantic model
-                    if parsed_summary.customer_info:
-                        customer_name = parsed_summary.customer_info.name or customer_name
-                        business_name = parsed_summary.customer_info.business_name or business_name
-                    
-                    if parsed_summary.executive_summary:
-                        executive_summary = parsed_summary.executive_summary.overview or executive_summary
-                elif isinstance(parsed_summary, dict):
-                    # Handle dictionary (fallback)
-                    customer_info = parsed_summary.get('customer_info', {})
-                    customer_name = customer_info.get('name', customer_name)
-                    business_name = customer_info.get('business_name', business_name)
-                    
-                    exec_summary_data = parsed_summary.get('executive_summary', {})
-                    if exec_summary_data:
-                        executive_summary = exec_summary_data.get('overview', executive_summary)
-            except Exception as e:
-                logger.warning(f"Error extracting summary data for email: {e}")
-                # Use defaults
+        customer_name = _extract(parsed_summary, 'customer_info', 'name', default=account_id or 'Customer')
+        business_name = _extract(parsed_summary, 'customer_info', 'business_name', default='Not specified')
+        executive_summary = _extract(
+            parsed_summary, 'executive_summary', 'overview', default='Analysis completed successfully.'
+        )
         
         # Generate secure download links using tokens
         base_url = f"https://fedfina.bionicaisolutions.com/api/v1/download/secure"
         
-        # Import the token generation function
-        import sys
-        import os
-        sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        from app import generate_download_token
-        
-        # Create download links for each file type
-        download_links = {}
-        
-        if 'transcript' in files:
-            token = generate_download_token(conversation_id, account_id, 'transcript')
-            download_links['transcript'] = f"{base_url}/{token}"
-        
-        if 'pdf' in files or 'report' in files:
-            token = generate_download_token(conversation_id, account_id, 'report')
-            download_links['report'] = f"{base_url}/{token}"
-        
-        if 'audio' in files:
-            token = generate_download_token(conversation_id, account_id, 'audio')
-            download_links['audio'] = f"{base_url}/{token}"
-        
-        # Create the download links HTML
+        # Create download links for each file type, with all tokens generated in one batch
+        file_types = tuple(
+            file_type for file_type, _, _, _ in _DOWNLOAD_ITEMS
+            if file_type in files or (file_type == 'report' and 'pdf' in files)
+        )
         download_links_html = ""
-        if download_links:
-            download_links_html = """
-            <div class="download-section">
-                <h3>Download Your Files</h3>
-                <p>Click on the links below to download your conversation files:</p>
-                <div class="download-links">
-            """
-            
-            if 'transcript' in download_links:
-                download_links_html += f"""
-                    <div class="download-item">
-                        <a href="{download_links['transcript']}" class="download-button">
-                            📄 Download Transcript (TXT)
-                        </a>
-                        <p class="download-description">Complete conversation transcript in text format</p>
-                    </div>
-                """
-            
-            if 'report' in download_links:
-                download_links_html += f"""
-                    <div class="download-item">
-                        <a href="{download_links['report']}" class="download-button">
-                            📊 Download Report (PDF)
-                        </a>
-                        <p class="download-description">Detailed analysis report with financial insights</p>
-                    </div>
-                """
-            
-            if 'audio' in download_links:
-                download_links_html += f"""
-                    <div class="download-item">
-                        <a href="{download_links['audio']}" class="download-button">
-                            🎵 Download Audio (MP3)
-                        </a>
-                        <p class="download-description">Original conversation audio recording</p>
-                    </div>
-                """
-            
-            download_links_html += """
-                </div>
-                <div class="download-note">
-                    <p><strong>Security Note:</strong> These links are secure and will expire after 24 hours or after 10 downloads. No authentication required.</p>
-                </div>
-            </div>
-            """
-        
-        html_body = f"""
-        <html>
-        <head>
-            <style>
-                body {{ 
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
-                    line-height: 1.6; 
-                    color: #1f2937; 
-                    max-width: 600px; 
-                    margin: 0 auto; 
-                    background-color: #f9fafb;
-                }}
-                .header {{ 
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                    color: white; 
-                    padding: 30px 20px; 
-                    border-radius: 12px 12px 0 0; 
-                    text-align: center; 
-                    margin-bottom: 0;
-                }}
-                .content {{ 
-                    padding: 30px 20px; 
-                    background-color: white; 
-                    border-radius: 0 0 12px 12px;
-                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.05);
-                }}
-                .metadata {{ 
-                    background-color: #f3f4f6; 
-                    padding: 20px; 
-                    border-radius: 8px; 
-                    margin: 20px 0; 
-                    border-left: 4px solid #3b82f6;
-                }}
-                .footer {{ 
-                    background-color: #f8f9fa; 
-                    padding: 20px; 
-                    border-radius: 8px; 
-                    font-size: 12px; 
-                    color: #6b7280; 
-                    text-align: center; 
-                    margin-top: 20px;
-                    border: 1px solid #e5e7eb;
-                }}
-                .highlight {{ color: #3b82f6; font-weight: 600; }}
-                .download-section {{ 
-                    background: linear-gradient(135deg, #dbeafe 0%, #bfdbfe 100%); 
-                    padding: 25px; 
-                    border-radius: 12px; 
-                    margin: 25px 0; 
-                    border: 1px solid #93c5fd;
-                }}
-                .download-links {{ display: flex; flex-direction: column; gap: 15px; }}
-                .download-item {{ text-align: center; }}
-                .download-button {{ 
-                    display: inline-block; 
-                    background-color: #2563eb; 
-                    color: #ffffff; 
-                    padding: 15px 30px; 
-                    text-decoration: none; 
-                    border-radius: 8px; 
-                    font-weight: 600;
-                    font-size: 16px;
-                    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-                    border: 2px solid #1d4ed8;
-                    transition: all 0.3s ease;
-                }}
-                .download-button:hover {{ 
-                    background-color: #1d4ed8; 
-                    transform: translateY(-1px);
-                    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.15);
-                }}
-                .download-description {{ margin-top: 5px; font-size: 14px; color: #666; }}
-                .download-note {{ 
-                    background-color: #fef3c7; 
-                    border: 1px solid #f59e0b; 
-                    padding: 15px; 
-                    border-radius: 8px; 
-                    margin-top: 20px;
-                    font-size: 13px;
-                    color: #92400e;
-                }}
-                .file-info {{ 
-                    background-color: #d1fae5; 
-                    border: 1px solid #10b981; 
-                    padding: 15px; 
-                    border-radius: 8px; 
-                    margin: 15px 0;
-                    color: #065f46;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h2>🎉 Conversation Analysis Complete!</h2>
-                <p>Your conversation has been processed and analyzed successfully.</p>
-            </div>
-            
-            <div class="content">
-                <h3>Customer Information</h3>
-                <ul>
-                    <li><strong>Customer Name:</strong> <span class="highlight">{customer_name}</span></li>
-                    <li><strong>Business Name:</strong> {business_name}</li>
-                    <li><strong>Conversation ID:</strong> {conversation_id}</li>
-                    <li><strong>Report Generated:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}</li>
-                </ul>
-                
-                <div class="metadata">
-                    <h4>Executive Summary</h4>
-                    <p style="margin: 10px 0; line-height: 1.6;">{executive_summary}</p>
-                </div>
-                
-                <div class="file-info">
-                    <h4>Generated Files</h4>
-                    <p>The following files have been created for your conversation:</p>
-                    <ul>
-                        <li><strong>Transcript:</strong> Complete conversation in text format</li>
-                        <li><strong>Report:</strong> Detailed PDF analysis with financial insights</li>
-                        <li><strong>Audio:</strong> Original conversation recording</li>
-                    </ul>
-                </div>
-                
-                {download_links_html}
-                
-                <div class="metadata">
-                    <h4>What's Included in Your Report</h4>
-                    <ul>
-                        <li>Detailed income breakdown with calculations</li>
-                        <li>Comprehensive expense analysis</li>
-                        <li>Loan disbursement requirements and repayment capacity</li>
-                        <li>Risk assessment and recommendations</li>
-                        <li>Complete conversation transcript</li>
-                    </ul>
-                </div>
-            </div>
-            
-            <div class="footer">
-                <p>This report was generated automatically by the FedFina Postprocess API.</p>
-                <p>If you have any questions or need assistance, please contact our support team.</p>
-                <p><small>Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}</small></p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return html_body
+        if file_types:
+            tokens = get_download_tokens_fn()(conversation_id, account_id, list(file_types))
+            download_links_html = _download_section_template(file_types).substitute(
+                {f"{file_type}_url": f"{base_url}/{tokens[file_type]}" for file_type in file_types}
+            )
+
+        return _REPORT_HTML_TEMPLATE.substitute(
+            customer_name=customer_name,
+            business_name=business_name,
+            conversation_id=conversation_id,
+            generated_at=_now_strings()[1],
+            executive_summary=executive_summary,
+            download_links_html=download_links_html
+        )
 
     async def send_simple_report(
         self,
@@ -455,7 +965,8 @@ class EmailService:
         conversation_id: str,
         account_id: str,
         pdf_bytes: bytes,
-        summary: str
+        summary: str,
+        batch: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Send a simple conversation report via email with PDF attachment
@@ -466,6 +977,7 @@ class EmailService:
             account_id: The account ID
             pdf_bytes: PDF file bytes
             summary: Brief summary of the conversation
+            batch: Bulk run this send belongs to, from new_email_batch()
 
         Returns:
             Dict containing the email sending result
@@ -492,13 +1004,10 @@ class EmailService:
 
             logger.info(f"Sending simple report to {to_email} for conversation {conversation_id}")
 
-            # Create email message
-            msg = MIMEMultipart()
-            msg['From'] = self.from_email
-            msg['To'] = to_email
-            msg['Subject'] = f"Loan Application Analysis Report - {account_id or 'Customer'}"
+            subject = f"Loan Application Analysis Report - {account_id or 'Customer'}"
 
             # Create simple email body
+            generated_at = _now_strings()[1]
             body = f"""
             <html>
             <body>
@@ -510,42 +1019,12 @@ class EmailService:
 
                 <p>The attached PDF contains the complete conversation transcript and analysis.</p>
 
-                <p>Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
+                <p>Generated on: {generated_at}</p>
             </body>
             </html>
             """
 
-            msg.attach(MIMEText(body, 'html'))
-
-            # Attach PDF
-            pdf_attachment = MIMEBase('application', 'pdf')
-            pdf_attachment.set_payload(pdf_bytes)
-            encoders.encode_base64(pdf_attachment)
-            pdf_attachment.add_header(
-                'Content-Disposition',
-                f'attachment; filename=conversation_report_{conversation_id}.pdf'
-            )
-            msg.attach(pdf_attachment)
-
-            # Apply rate limiting and send email
-            rate_limited_send = self.rate_limit(self.send_email_with_retry)
-            result = rate_limited_send(msg)
-
-            if result["status"] == "success":
-                return {
-                    "status": "success",
-                    "message": f"Email sent successfully to {to_email}",
-                    "conversation_id": conversation_id,
-                    "timestamp": datetime.now().isoformat(),
-                    "attempts": result.get("attempts", 1)
-                }
-            else:
-                return {
-                    "status": "error",
-                    "error": result["error"],
-                    "conversation_id": conversation_id,
-                    "attempts": result.get("attempts", 0)
-                }
+            return await self._send_with_pdf(to_email, subject, body, conversation_id, pdf_bytes, batch)
 
         except Exception as e:
             logger.error(f"Error sending simple email: {e}")
@@ -555,19 +1034,128 @@ class EmailService:
                 "conversation_id": conversation_id
             }
 
-    def test_email_connection(self) -> Dict[str, Any]:
+    async def _send_with_pdf(
+        self,
+        to_email: str,
+        subject: str,
+        body_html: str,
+        conversation_id: str,
+        pdf_bytes: bytes,
+        batch: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build (or reuse) the PDF report message and send it to one recipient"""
+        # Only the To header differs between recipients of the same report
+        # Serializing (base64 of the PDF) runs in a worker thread
+        head, tail = await asyncio.to_thread(self._build_mime, conversation_id, pdf_bytes, subject)
+        raw_message = b"".join((f"To: {to_email}\r\n".encode(), head, _encode_html_body(body_html), tail))
+
+        # Apply rate limiting and send email
+        result = await self._send_queued(raw_message, [to_email], batch)
+        return self._format_send_result(result, to_email, conversation_id)
+
+    def _format_send_result(
+        self,
+        result: Dict[str, Any],
+        to_email: str,
+        conversation_id: str
+    ) -> Dict[str, Any]:
+        """Convert a send_email_with_retry result into the public response shape"""
+        if result["status"] == "success":
+            return {
+                "status": "success",
+                "message": f"Email sent successfully to {to_email}",
+                "conversation_id": conversation_id,
+                "timestamp": _now_strings()[0],
+                "attempts": result.get("attempts", 1)
+            }
+        return {
+            "status": "error",
+            "error": result["error"],
+            "conversation_id": conversation_id,
+            "attempts": result.get("attempts", 0)
+        }
+
+    def _build_mime(
+        self,
+        conversation_id: str,
+        pdf_bytes: bytes,
+        subject: str
+    ) -> Tuple[bytes, bytes]:
+        """
+        Build and serialize a report message with its PDF attachment
+
+        The HTML body carries a per-send timestamp, so it is left out: the
+        message is serialized around a placeholder and returned as the bytes
+        before and after it. The result omits the To header and is memoized
+        on the PDF digest, so the same report sent to several recipients is
+        only encoded once.
+
+        Returns:
+            The serialized message (CRLF line endings) before and after the
+            quoted-printable HTML body
+        """
+        global _mime_cache_bytes
+        pdf_sha256 = hashlib.sha256(pdf_bytes).digest()
+        key = (self.from_email, conversation_id, pdf_sha256, subject)
+
+        with _mime_cache_lock:
+            cached = _mime_cache.get(key)
+            if cached is not None:
+                _mime_cache.move_to_end(key)
+                return cached
+
+        msg = EmailMessage()
+        msg['From'] = self.from_email
+        msg['Subject'] = subject
+        msg.set_content(
+            _REPORT_BODY_PLACEHOLDER.decode(), subtype='html', charset='utf-8', cte='quoted-printable'
+        )
+
+        # Attach PDF (base64 is encoded once by the content manager via binascii)
+        msg.add_attachment(
+            pdf_bytes,
+            maintype='application',
+            subtype='pdf',
+            filename=f'conversation_report_{conversation_id}.pdf'
+        )
+        raw_message = _serialize_message(msg)
+        del msg
+
+        head, _, tail = raw_message.partition(_REPORT_BODY_PLACEHOLDER + b"\r\n")
+        parts = (head, tail)
+        size = len(head) + len(tail)
+
+        with _mime_cache_lock:
+            if key not in _mime_cache and size <= MIME_CACHE_MAX_BYTES:
+                _mime_cache[key] = parts
+                _mime_cache_bytes += size
+                while _mime_cache_bytes > MIME_CACHE_MAX_BYTES:
+                    _, (old_head, old_tail) = _mime_cache.popitem(last=False)
+                    _mime_cache_bytes -= len(old_head) + len(old_tail)
+
+        return parts
+
+    async def test_email_connection(self, deep: bool = False) -> Dict[str, Any]:
         """
         Test email service connection to Postfix relay
 
+        Args:
+            deep: Open and close a fresh connection instead of checking a pooled one
+
         Returns:
             Dict containing the test result
         """
         try:
             logger.info("Testing connection to Postfix SMTP relay...")
 
-            # Test connection to Postfix SMTP relay (no authentication required)
-            server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=10.0)
-            server.quit()
+            if deep:
+                # Full connect to Postfix SMTP relay (no authentication required)
+                smtp = await self._connect(timeout=10.0)
+                await smtp.quit()
+            else:
+                # Checkout NOOPs a pooled connection and only connects when the pool is empty
+                smtp, sent = await self._checkout_connection()
+                await self._checkin_connection(smtp, sent)
 
             logger.info("Email service connection test successful")
             return {
@@ -577,7 +1165,7 @@ class EmailService:
                 "relay_port": self.smtp_port
             }
 
-        except smtplib.SMTPException as e:
+        except aiosmtplib.SMTPException as e:
             logger.error(f"SMTP connection test failed: {e}")
             return {
                 "status": "error",
@@ -594,7 +1182,7 @@ class EmailService:
                 "relay_port": self.smtp_port
             }
 
-    def health_check(self) -> Dict[str, Any]:
+    async def health_check(self) -> Dict[str, Any]:
         """
         Check email service health
 
@@ -603,7 +1191,7 @@ class EmailService:
         """
         try:
             # Test SMTP connection
-            connection_result = self.test_email_connection()
+            connection_result = await self.test_email_connection()
 
             if connection_result.get("status") == "success":
                 return {
@@ -612,7 +1200,7 @@ class EmailService:
                     "relay_host": self.smtp_host,
                     "relay_port": self.smtp_port,
                     "rate_limit": f"{self.rate_limit_calls_per_minute} calls/minute",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_strings()[0]
                 }
             else:
                 return {
@@ -620,7 +1208,7 @@ class EmailService:
                     "message": f"Email service error: {connection_result.get('error')}",
                     "relay_host": self.smtp_host,
                     "relay_port": self.smtp_port,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_strings()[0]
                 }
 
         except Exception as e:
@@ -628,7 +1216,7 @@ class EmailService:
             return {
                 "status": "unhealthy",
                 "message": f"Email service error: {str(e)}",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_strings()[0]
             }
 
     def get_metrics(self) -> Dict[str, Any]:
@@ -638,12 +1226,13 @@ class EmailService:
         Returns:
             Dict containing service metrics
         """
+        last_slot = _next_send_at - self._min_interval
         return {
             "service": "Postfix SMTP Relay",
             "relay_host": self.smtp_host,
             "relay_port": self.smtp_port,
             "from_email": self.from_email,
             "rate_limit_calls_per_minute": self.rate_limit_calls_per_minute,
-            "last_rate_limit_check": datetime.fromtimestamp(self.rate_limit_last_called[0]).isoformat() if self.rate_limit_last_called[0] > 0 else None,
-            "timestamp": datetime.now().isoformat()
+            "last_rate_limit_check": datetime.fromtimestamp(time.time() - (time.monotonic() - last_slot)).isoformat() if _next_send_at > 0 else None,
+            "timestamp": _now_strings()[0]
         }
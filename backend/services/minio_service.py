@@ -1,29 +1,235 @@
 """
 MinIO Service for file storage operations
 """
+import asyncio
+import functools
 import logging
 import io
-from typing import Dict, Any, Optional, BinaryIO
+import os
+import socket
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Callable, Dict, Any, Optional, BinaryIO, Tuple
+import certifi
+import urllib3
 from minio import Minio
 from minio.error import S3Error
 from config import Settings
 
 logger = logging.getLogger(__name__)
 
+# Large audio/PDF uploads are split into parts of this size and pushed over
+# several connections; a failed part is retried on its own.
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+MULTIPART_PARALLEL_UPLOADS = 4
 
-class MinIOService:
-    """Service for MinIO file storage operations"""
-    
-    def __init__(self, settings: Settings):
-        self.settings = settings
-        self.client = Minio(
+# TCP keepalive on pooled sockets lets a connection dropped by the object
+# store or a proxy be noticed before a request is written to it
+_SOCKET_OPTIONS = urllib3.connection.HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+if hasattr(socket, "TCP_KEEPIDLE"):
+    _SOCKET_OPTIONS += [
+        (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60),
+        (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 15),
+        (socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 4),
+    ]
+
+# MinIO client shared by every MinIOService instance, so its keep-alive
+# connections to the object store survive across requests. The client is
+# shared rather than just its pool: Minio.__del__ clears the pool it was given.
+_client: Optional[Minio] = None
+_http_client: Optional[urllib3.PoolManager] = None
+
+
+def get_minio_client(settings: Settings) -> Minio:
+    """Get the process-wide MinIO client"""
+    global _client, _http_client
+    if _client is None:
+        _http_client = _new_http_client(settings.minio_pool_size, settings.minio_read_timeout_seconds)
+        _client = Minio(
             endpoint=settings.minio_endpoint,
             access_key=settings.minio_access_key,
             secret_key=settings.minio_secret_key,
             secure=settings.minio_secure,
-            region=settings.minio_region
+            region=settings.minio_region,
+            http_client=_http_client
+        )
+    return _client
+
+
+def _new_http_client(maxsize: int, read_timeout: float) -> urllib3.PoolManager:
+    """Build the tuned urllib3 pool used by the MinIO client"""
+    return urllib3.PoolManager(
+        num_pools=10,
+        maxsize=max(1, maxsize),
+        block=False,
+        socket_options=_SOCKET_OPTIONS,
+        timeout=urllib3.util.Timeout(connect=5, read=read_timeout),
+        cert_reqs='CERT_REQUIRED',
+        ca_certs=os.environ.get('SSL_CERT_FILE') or certifi.where(),
+        retries=urllib3.Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=[500, 502, 503, 504]
         )
+    )
+
+
+# Bounded worker pool for the blocking MinIO SDK calls, sized to match the
+# HTTP pool so every worker can hold a connection
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Get the process-wide thread pool that runs MinIO client calls"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="minio")
+    return _executor
+
+
+def close_minio_client() -> None:
+    """
+    Stop the MinIO thread pool and close the shared client's pooled connections
+    
+    Called once by the application lifespan on shutdown; service instances
+    look the client up on use, so they never hold on to a closed one.
+    """
+    global _executor, _client, _http_client
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+    if _http_client is not None:
+        _http_client.clear()
+        _http_client = None
+    _client = None
+
+
+# Presigned download URLs are only handed out for immediate redirects
+PRESIGNED_URL_EXPIRY = timedelta(minutes=15)
+
+# Object key layout per downloadable file type: (folder, extension, content type)
+_FILE_TYPE_OBJECTS = {
+    "transcript": ("transcripts", "txt", "text/plain"),
+    "report": ("reports", "pdf", "application/pdf"),
+    "audio": ("audio", "mp3", "audio/mpeg"),
+}
+
+# Recently downloaded transcripts and reports with their ETags. A cached copy
+# is still checked with a HEAD request, so the cache saves the transfer, not
+# the round trip. It is bounded by the bytes it holds; objects over
+# FILE_CACHE_MAX_OBJECT_BYTES, and audio, are never cached.
+FILE_CACHE_TTL = 300.0
+FILE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+FILE_CACHE_MAX_OBJECT_BYTES = 4 * 1024 * 1024
+_file_cache: "OrderedDict[str, Tuple[float, str, bytes]]" = OrderedDict()
+_file_cache_bytes = 0
+
+
+def _evict_cached(object_name: str) -> None:
+    """Drop the cached copy of an object, if any"""
+    global _file_cache_bytes
+    cached = _file_cache.pop(object_name, None)
+    if cached is not None:
+        _file_cache_bytes -= len(cached[2])
+
+
+class MinIOService:
+    """Service for MinIO file storage operations"""
+    
+    def __init__(self, settings: Settings):
+        self.settings = settings
         self.bucket_name = settings.minio_bucket_name
+
+    @property
+    def client(self) -> Minio:
+        """The process-wide MinIO client"""
+        return get_minio_client(self.settings)
+
+    async def _run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking MinIO client call on the MinIO thread pool
+        
+        Args:
+            fn: Client method to call
+            *args: Positional arguments for the call
+            **kwargs: Keyword arguments for the call
+            
+        Returns:
+            Whatever the client call returns
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_executor(self.settings.minio_pool_size),
+            functools.partial(fn, *args, **kwargs)
+        )
+
+    def _read_object(self, object_name: str) -> Tuple[bytes, str]:
+        """
+        Download an object body and hand its connection back to the pool
+        
+        Args:
+            object_name: Object key within the bucket
+            
+        Returns:
+            Object content bytes and the object's ETag
+        """
+        response = self.client.get_object(self.bucket_name, object_name)
+        try:
+            return response.read(), response.headers.get("ETag", "").strip('"')
+        finally:
+            response.close()
+            response.release_conn()
+    
+    async def _read_cached(self, object_name: str) -> bytes:
+        """
+        Download an object body, serving recent downloads from the file cache
+        
+        A cached copy is only served after a stat shows the object's ETag is
+        unchanged, so a file rewritten through another pod is fetched afresh.
+        
+        Args:
+            object_name: Object key within the bucket
+            
+        Returns:
+            Object content bytes
+        """
+        global _file_cache_bytes
+        cached = _file_cache.get(object_name)
+        if cached is not None:
+            expires_at, etag, content = cached
+            if expires_at > time.monotonic():
+                try:
+                    stat = await self._run(self.client.stat_object, self.bucket_name, object_name)
+                except Exception as e:
+                    logger.debug(f"Revalidating cached {object_name} failed, refetching: {e}")
+                    stat = None
+                if stat is not None and stat.etag == etag:
+                    if object_name in _file_cache:
+                        _file_cache.move_to_end(object_name)
+                    return content
+
+        content, etag = await self._run(self._read_object, object_name)
+
+        _evict_cached(object_name)
+        if etag and len(content) <= FILE_CACHE_MAX_OBJECT_BYTES:
+            _file_cache[object_name] = (time.monotonic() + FILE_CACHE_TTL, etag, content)
+            _file_cache_bytes += len(content)
+            while _file_cache_bytes > FILE_CACHE_MAX_BYTES:
+                _, (_, _, old_content) = _file_cache.popitem(last=False)
+                _file_cache_bytes -= len(old_content)
+        return content
+    
+    async def startup(self) -> None:
+        """Open a pooled connection to the object store ahead of the first request"""
+        try:
+            await self._run(self.client.bucket_exists, self.bucket_name)
+            logger.info(f"MinIO connection warmed up: {self.settings.minio_endpoint}")
+        except Exception as e:
+            logger.warning(f"MinIO warm-up failed, connecting on first request: {e}")
     
     async def store_audio_file(self, account_id: str, conversation_id: str, audio_data: bytes, file_extension: str = "mp3") -> Dict[str, Any]:
         """
@@ -46,12 +252,15 @@ class MinIOService:
             audio_stream = io.BytesIO(audio_data)
             
             # Upload file to MinIO
-            result = self.client.put_object(
+            result = await self._run(
+                self.client.put_object,
                 bucket_name=self.bucket_name,
                 object_name=object_name,
                 data=audio_stream,
                 length=len(audio_data),
-                content_type="audio/mpeg"
+                content_type="audio/mpeg",
+                part_size=MULTIPART_PART_SIZE,
+                num_parallel_uploads=MULTIPART_PARALLEL_UPLOADS
             )
             
             # Generate URL for the stored file
@@ -101,7 +310,8 @@ class MinIOService:
             transcript_stream = io.BytesIO(transcript_bytes)
             
             # Upload file to MinIO
-            result = self.client.put_object(
+            result = await self._run(
+                self.client.put_object,
                 bucket_name=self.bucket_name,
                 object_name=object_name,
                 data=transcript_stream,
@@ -109,6 +319,9 @@ class MinIOService:
                 content_type="text/plain"
             )
             
+            # Drop any cached copy of the object just overwritten
+            _evict_cached(object_name)
+            
             # Generate URL for the stored file
             file_url = f"http://{self.settings.minio_endpoint}/{self.bucket_name}/{object_name}"
             
@@ -153,14 +366,20 @@ class MinIOService:
             pdf_stream = io.BytesIO(pdf_data)
             
             # Upload file to MinIO
-            result = self.client.put_object(
+            result = await self._run(
+                self.client.put_object,
                 bucket_name=self.bucket_name,
                 object_name=object_name,
                 data=pdf_stream,
                 length=len(pdf_data),
-                content_type="application/pdf"
+                content_type="application/pdf",
+                part_size=MULTIPART_PART_SIZE,
+                num_parallel_uploads=MULTIPART_PARALLEL_UPLOADS
             )
             
+            # Drop any cached copy of the object just overwritten
+            _evict_cached(object_name)
+            
             # Generate URL for the stored file
             file_url = f"http://{self.settings.minio_endpoint}/{self.bucket_name}/{object_name}"
             
@@ -189,46 +408,21 @@ class MinIOService:
         """
         Create folder structure for an account
         
+        S3/MinIO keys are a flat namespace: the {account_id}/audio/,
+        /transcripts/ and /reports/ prefixes come into being with the first
+        object stored under them, so no placeholder objects are uploaded.
+        
         Args:
             account_id: Account identifier
             
         Returns:
             Dict containing folder creation result
         """
-        try:
-            # Create folder structure by uploading empty objects
-            folders = [
-                f"{account_id}/audio/",
-                f"{account_id}/transcripts/",
-                f"{account_id}/reports/"
-            ]
-            
-            created_folders = []
-            for folder in folders:
-                try:
-                    # Create folder by uploading an empty object
-                    self.client.put_object(
-                        bucket_name=self.bucket_name,
-                        object_name=folder,
-                        data=b"",
-                        length=0
-                    )
-                    created_folders.append(folder)
-                except S3Error as e:
-                    logger.warning(f"Could not create folder {folder}: {e}")
-            
-            return {
-                "status": "success",
-                "created_folders": created_folders,
-                "account_id": account_id
-            }
-            
-        except Exception as e:
-            logger.error(f"Error creating account folders: {e}")
-            return {
-                "status": "error",
-                "error": f"Error creating folders: {str(e)}"
-            }
+        return {
+            "status": "success",
+            "created_folders": [],
+            "account_id": account_id
+        }
     
     async def health_check(self) -> Dict[str, Any]:
         """
@@ -239,7 +433,7 @@ class MinIOService:
         """
         try:
             # Test bucket access
-            self.client.bucket_exists(self.bucket_name)
+            await self._run(self.client.bucket_exists, self.bucket_name)
             
             return {
                 "status": "healthy",
@@ -274,11 +468,8 @@ class MinIOService:
             # Create object name with folder structure
             object_name = f"{account_id}/transcripts/{conversation_id}.txt"
             
-            # Get object from MinIO
-            response = self.client.get_object(self.bucket_name, object_name)
-            
-            # Read file content
-            content = response.read()
+            # Get object content from MinIO
+            content = await self._read_cached(object_name)
             
             return {
                 "content": content,
@@ -313,11 +504,8 @@ class MinIOService:
             # Create object name with folder structure
             object_name = f"{account_id}/reports/{conversation_id}.pdf"
             
-            # Get object from MinIO
-            response = self.client.get_object(self.bucket_name, object_name)
-            
-            # Read file content
-            content = response.read()
+            # Get object content from MinIO
+            content = await self._read_cached(object_name)
             
             return {
                 "content": content,
@@ -352,11 +540,8 @@ class MinIOService:
             # Create object name with folder structure
             object_name = f"{account_id}/audio/{conversation_id}.mp3"
             
-            # Get object from MinIO
-            response = self.client.get_object(self.bucket_name, object_name)
-            
-            # Read file content
-            content = response.read()
+            # Get object content from MinIO; audio is too large to cache
+            content, _ = await self._run(self._read_object, object_name)
             
             return {
                 "content": content,
@@ -375,3 +560,51 @@ class MinIOService:
         except Exception as e:
             logger.error(f"Unexpected error retrieving audio file: {e}")
             return None
+
+    async def get_presigned_url(self, account_id: str, conversation_id: str, file_type: str, filename: str) -> Optional[str]:
+        """
+        Create a short-lived presigned URL for downloading a file directly from MinIO
+        
+        Args:
+            account_id: Account identifier for folder organization
+            conversation_id: Conversation identifier
+            file_type: Type of file (transcript, report, audio)
+            filename: Download filename sent in the Content-Disposition header
+            
+        Returns:
+            Presigned URL, or None if the file type is unknown, the file does
+            not exist or signing failed
+        """
+        if file_type not in _FILE_TYPE_OBJECTS:
+            return None
+        folder, extension, content_type = _FILE_TYPE_OBJECTS[file_type]
+        object_name = f"{account_id}/{folder}/{conversation_id}.{extension}"
+        
+        # Signing never touches the server, so check the file exists before
+        # sending the client off to MinIO for it
+        try:
+            await self._run(self.client.stat_object, self.bucket_name, object_name)
+        except S3Error as e:
+            if e.code == 'NoSuchKey':
+                logger.warning(f"File not found in MinIO: {object_name}")
+            else:
+                logger.error(f"MinIO error checking {object_name}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Error checking {object_name}: {e}")
+            return None
+        
+        try:
+            return await self._run(
+                self.client.presigned_get_object,
+                self.bucket_name,
+                object_name,
+                expires=PRESIGNED_URL_EXPIRY,
+                response_headers={
+                    "response-content-type": content_type,
+                    "response-content-disposition": f'attachment; filename="{filename}"'
+                }
+            )
+        except Exception as e:
+            logger.error(f"Error creating presigned URL for {object_name}: {e}")
+            return None
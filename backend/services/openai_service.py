@@ -1,38 +1,159 @@
 """
 OpenAI Service for conversation summarization
 """
+import asyncio
+import hashlib
 import logging
 import json
+import re
+import time
+import httpx
 import openai
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 from pydantic import ValidationError
 from config import Settings
 from models.openai_response_models import OpenAIStructuredResponse
 
 logger = logging.getLogger(__name__)
 
+# Client shared by every OpenAIService instance, so its HTTP keep-alive pool
+# survives across requests
+_client: Optional[openai.AsyncOpenAI] = None
+
+# Caps in-flight completions so a burst of reports queues locally instead of
+# running into the account's rate limits and retrying
+_completion_semaphore: Optional[asyncio.Semaphore] = None
+
+
+# JSON string literals honouring backslash escapes; group 1 is unset when
+# the text ends inside the string
+_JSON_STRING_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*(?:(")|\\?\Z)')
+
+
+def _json_structure(text: str) -> Tuple[int, int, bool]:
+    """
+    Count unclosed braces and brackets in possibly truncated JSON
+    
+    String literals are blanked out first so braces, brackets and escaped
+    quotes inside them are not counted.
+    
+    Args:
+        text: The JSON text to inspect
+        
+    Returns:
+        Tuple of (missing braces, missing brackets, ends inside a string)
+    """
+    # Complete strings become "" and an unterminated one a single quote
+    structure = _JSON_STRING_RE.sub(lambda m: '""' if m.group(1) else '"', text)
+    return (
+        structure.count('{') - structure.count('}'),
+        structure.count('[') - structure.count(']'),
+        structure.count('"') % 2 == 1
+    )
+
+
+# Trailing commas directly before a closing brace or bracket
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+
+
+# System message sent with every summarization request
+_SUMMARY_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a professional financial analyst creating comprehensive summary reports from business loan interview transcripts. Always respond with valid JSON format. IMPORTANT: If the transcript is in any language other than English, translate ALL content to English before analysis. Provide the entire response in English only."
+}
+
+# Successful summaries keyed by a hash of everything sent to the model, so
+# reprocessing the same conversation does not pay for a second completion.
+# Only used when OPENAI_SUMMARY_CACHE_TTL_SECONDS is set.
+SUMMARY_CACHE_MAXSIZE = 128
+_summary_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+
+def get_openai_client(settings: Settings) -> openai.AsyncOpenAI:
+    """Get the process-wide AsyncOpenAI client"""
+    global _client
+    if _client is None:
+        _client = openai.AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            max_retries=settings.openai_max_retries,
+            timeout=httpx.Timeout(settings.openai_timeout_seconds, connect=5.0)
+        )
+    return _client
+
+
+def get_completion_semaphore(limit: int) -> asyncio.Semaphore:
+    """Get the process-wide semaphore bounding concurrent completions"""
+    global _completion_semaphore
+    if _completion_semaphore is None:
+        _completion_semaphore = asyncio.Semaphore(max(1, limit))
+    return _completion_semaphore
+
+
+async def close_openai_client() -> None:
+    """
+    Close the shared OpenAI client and its pooled connections
+    
+    Called once by the application lifespan on shutdown; service instances
+    look the client up on use, so they never hold on to a closed one.
+    """
+    global _client, _completion_semaphore
+    if _client is not None:
+        await _client.close()
+        _client = None
+    # Recreated on the running loop by the next completion
+    _completion_semaphore = None
+
 
 class OpenAIService:
     """Service for OpenAI API interactions"""
 
     def __init__(self, settings: Settings):
         self.settings = settings
-        self.client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
         self.model = settings.openai_model
         self.max_tokens = settings.openai_max_tokens
         self.temperature = settings.openai_temperature
+        self.max_concurrency = settings.openai_max_concurrency
+        # Hard deadline for a completion including the SDK's own retries
+        self.request_deadline = settings.openai_timeout_seconds * (settings.openai_max_retries + 1)
+        self.summary_cache_ttl = settings.openai_summary_cache_ttl_seconds
 
-    async def summarize_conversation(self, transcript: str, prompt_template: str) -> Dict[str, Any]:
+    @property
+    def client(self) -> openai.AsyncOpenAI:
+        """The process-wide AsyncOpenAI client"""
+        return get_openai_client(self.settings)
+
+    async def summarize_conversation(self, transcript: str, prompt_template: str, use_cache: bool = True) -> Dict[str, Any]:
         """
         Summarize conversation using OpenAI API
         
         Args:
             transcript: The conversation transcript to summarize
             prompt_template: The prompt template to use for summarization
+            use_cache: Whether a cached summary may be returned; pass False to regenerate
             
         Returns:
-            Dict containing summarization result
+            Dict containing summarization result. A cached result has "cached"
+            set and zero token usage, since no completion was paid for.
         """
+        cache_key = hashlib.blake2b(
+            f"{self.model}|{self.temperature}|{self.max_tokens}|{prompt_template}|{transcript}".encode('utf-8'),
+            digest_size=16
+        ).hexdigest()
+        if self.summary_cache_ttl > 0 and use_cache:
+            cached = _summary_cache.get(cache_key)
+            if cached is not None:
+                expires_at, cached_result = cached
+                if expires_at > time.monotonic():
+                    _summary_cache.move_to_end(cache_key)
+                    logger.info(f"Reusing cached summary for identical transcript and prompt ({cache_key[:8]})")
+                    return {
+                        **cached_result,
+                        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                        "cached": True
+                    }
+                del _summary_cache[cache_key]
+        
         try:
             # Check if transcript is too long and truncate if necessary
             max_transcript_length = 100000  # Much higher limit for gpt-4o-mini (128K context)
@@ -46,22 +167,23 @@ class OpenAIService:
             formatted_prompt = prompt_template.replace("{transcript}", transcript)
             
             # Create the chat completion request with JSON response format
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a professional financial analyst creating comprehensive summary reports from business loan interview transcripts. Always respond with valid JSON format. IMPORTANT: If the transcript is in any language other than English, translate ALL content to English before analysis. Provide the entire response in English only."
-                    },
-                    {
-                        "role": "user", 
-                        "content": formatted_prompt
-                    }
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                response_format={"type": "json_object"}
-            )
+            async with get_completion_semaphore(self.max_concurrency):
+                response = await asyncio.wait_for(
+                    self.client.chat.completions.create(
+                        model=self.model,
+                        messages=[
+                            _SUMMARY_SYSTEM_MESSAGE,
+                            {
+                                "role": "user", 
+                                "content": formatted_prompt
+                            }
+                        ],
+                        max_tokens=self.max_tokens,
+                        temperature=self.temperature,
+                        response_format={"type": "json_object"}
+                    ),
+                    timeout=self.request_deadline
+                )
             
             # Extract and parse the JSON response
             raw_response = response.choices[0].message.content
@@ -116,7 +238,7 @@ class OpenAIService:
             # Get usage information
             usage = response.usage
             
-            return {
+            result = {
                 "status": "success",
                 "summary": summary,
                 "parsed_summary": parsed_summary,
@@ -128,6 +250,21 @@ class OpenAIService:
                 "model": self.model
             }
             
+            # Only cache fully validated summaries; a malformed one may come
+            # back valid on the next attempt
+            if self.summary_cache_ttl > 0 and isinstance(parsed_summary, OpenAIStructuredResponse):
+                _summary_cache[cache_key] = (time.monotonic() + self.summary_cache_ttl, result)
+                if len(_summary_cache) > SUMMARY_CACHE_MAXSIZE:
+                    _summary_cache.popitem(last=False)
+            
+            return result
+            
+        except asyncio.TimeoutError:
+            logger.error(f"OpenAI summarization timed out after {self.request_deadline:.0f}s")
+            return {
+                "status": "error",
+                "error": f"Request timed out after {self.request_deadline:.0f} seconds"
+            }
         except openai.RateLimitError as e:
             logger.error(f"OpenAI rate limit exceeded: {e}")
             return {
@@ -319,46 +456,31 @@ class OpenAIService:
             Repaired JSON string or None if repair fails
         """
         try:
-            # Clean up the string
+            # Clean up the string; callers only get here after json.loads
+            # failed, so there is no point re-checking it as-is
             cleaned = json_string.strip()
             
-            # Check if it's already valid JSON
-            try:
-                json.loads(cleaned)
-                return cleaned  # Already valid
-            except json.JSONDecodeError:
-                pass
-            
             # Common repair strategies
             
-            # 1. Add missing closing braces/brackets
-            open_braces = cleaned.count('{')
-            close_braces = cleaned.count('}')
-            open_brackets = cleaned.count('[')
-            close_brackets = cleaned.count(']')
+            # 1. Close an unterminated string, then missing braces/brackets
+            missing_braces, missing_brackets, in_string = _json_structure(cleaned)
             
-            if open_braces > close_braces:
-                missing_braces = open_braces - close_braces
+            if in_string:
+                cleaned += '"'
+                logger.info("Added missing closing quote")
+            
+            if missing_braces > 0:
                 cleaned += '}' * missing_braces
                 logger.info(f"Added {missing_braces} missing closing braces")
             
-            if open_brackets > close_brackets:
-                missing_brackets = open_brackets - close_brackets
+            if missing_brackets > 0:
                 cleaned += ']' * missing_brackets
                 logger.info(f"Added {missing_brackets} missing closing brackets")
             
-            # 2. Handle unterminated strings
-            # Find the last quote and see if it's properly closed
-            if cleaned.count('"') % 2 == 1:
-                # Odd number of quotes means unterminated string
-                cleaned += '"'
-                logger.info("Added missing closing quote")
-            
-            # 3. Remove trailing commas before closing braces/brackets
-            import re
-            cleaned = re.sub(r',(\s*[}\]])', r'\1', cleaned)
+            # 2. Remove trailing commas before closing braces/brackets
+            cleaned = _TRAILING_COMMA_RE.sub(r'\1', cleaned)
             
-            # 4. Handle incomplete JSON objects/arrays at the end
+            # 3. Handle incomplete JSON objects/arrays at the end
             # If the JSON ends abruptly in the middle of a string or object, try to close it gracefully
             if not cleaned.rstrip().endswith(('}', ']')):
                 # Find the last complete JSON structure and truncate there
@@ -370,7 +492,7 @@ class OpenAIService:
                     cleaned = cleaned[:last_complete + 1]
                     logger.info("Truncated to last complete JSON structure")
             
-            # 5. Try to parse the repaired JSON
+            # 4. Try to parse the repaired JSON
             json.loads(cleaned)
             return cleaned
             
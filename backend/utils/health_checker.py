@@ -114,7 +114,7 @@ class HealthChecker:
         try:
             from services.email_service import EmailService
             email_service = EmailService(self.settings)
-            email_result = email_service.test_email_connection()
+            email_result = await email_service.test_email_connection()
             
             if email_result.get("status") == "success":
                 return {
@@ -42,7 +42,8 @@ def regenerate_conversation(conversation_id: str) -> dict:
         "email_id": EMAIL_ID,
         "account_id": ACCOUNT_ID,
         "conversation_id": conversation_id,
-        "send_email": True
+        "send_email": True,
+        "regenerate": True
     }
 
     headers = {
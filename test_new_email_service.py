@@ -2,6 +2,7 @@
 """
 Test script for the new Postfix SMTP relay email service
 """
+import asyncio
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
@@ -21,7 +22,7 @@ def test_email_service():
 
     # Test 1: Health check
     print("1️⃣ Testing health check...")
-    health_result = email_service.health_check()
+    health_result = asyncio.run(email_service.health_check())
     print(f"   Status: {health_result.get('status')}")
     print(f"   Message: {health_result.get('message')}")
     print(f"   Relay: {health_result.get('relay_host')}:{health_result.get('relay_port')}")
@@ -43,7 +44,7 @@ def test_email_service():
 
     # Test 3: Connection test
     print("\n3️⃣ Testing SMTP connection...")
-    connection_result = email_service.test_email_connection()
+    connection_result = asyncio.run(email_service.test_email_connection(deep=True))
     print(f"   Status: {connection_result.get('status')}")
     print(f"   Message: {connection_result.get('message')}")
 